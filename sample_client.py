@@ -10,34 +10,44 @@ async def do_the_magic(url: str, site: str, username: str, password: str):
     """ Not a real test client. """
 
     async with OmadaClient(url, username, password,site=site) as client:
-        devices = await client.get_devices()
+        devices, controller_name = await asyncio.gather(
+            client.get_devices(), client.get_controller_name())
 
-        print(f"Found Omada Controller: {await client.get_controller_name()}")
+        print(f"Found Omada Controller: {controller_name}")
+
+        devices_by_type = {}
+        for device in devices:
+            devices_by_type.setdefault(device.type, []).append(device)
+        access_points = devices_by_type.get("ap", [])
+        switches = devices_by_type.get("switch", [])
+        gateways = devices_by_type.get("gateway", [])
 
         print(f"Found {len(devices)} Omada devices.")
-        print(f"    {len([d for d in devices if d.type == 'ap'])} Access Points.")
-        print(f"    {len([d for d in devices if d.type == 'switch'])} Switches.")
-        print(f"    {len([d for d in devices if d.type == 'gateway'])} Routers.")
+        print(f"    {len(access_points)} Access Points.")
+        print(f"    {len(switches)} Switches.")
+        print(f"    {len(gateways)} Routers.")
 
-        pprint(vars(devices[0]))
+        print(repr(devices[0]))
 
         # Get full info of all switches
-        switches = [await client.get_switch(s) for s in devices if s.type == "switch"]
+        switches = await asyncio.gather(*(client.get_switch(s) for s in switches))
 
-        pprint(vars(switches[0]))
+        print(repr(switches[0]))
+        # Full dump of everything the controller returned for the switch
+        pprint(switches[0].to_dict())
 
         #ports = await client.get_switch_ports(switches[0])
 
         port = await client.get_switch_port(switches[0], switches[0].ports[4])
         print(f"Port index 4: {port.name} Profile: {port.profile_name}")
-        pprint(vars(port))
+        print(repr(port))
 
         updated_port = await client.update_switch_port(
             switches[0], port, new_name="Port5")
-        pprint(vars(updated_port))
+        print(repr(updated_port))
 
         profiles = await client.get_port_profiles()
-        pprint(vars(profiles[0]))
+        print(repr(profiles[0]))
 
         print("Done.")
 
@@ -3,6 +3,7 @@ Definitions for Omada device objects
 
 APs, Switches and Routers
 """
+from functools import cached_property
 from typing import (Any, Dict, List, Optional)
 from .definitions import (
     BandwidthControl,
@@ -16,12 +17,25 @@ from .definitions import (
 )
 
 
-class OmadaDevice:
-    """ Details of a device connected to the controller """
+class OmadaApiData:
+    """ Base for all wrappers of data returned by the Omada controller. """
+    __slots__ = ("_data",)
 
     def __init__(self, data: Dict[str, Any]):
         self._data = data
 
+    def to_dict(self) -> Dict[str, Any]:
+        """ The raw data returned by the controller, for diagnostic purposes. """
+        return self._data
+
+
+class OmadaDevice(OmadaApiData):
+    """ Details of a device connected to the controller """
+    __slots__ = ()
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(name={self.name!r}, mac={self.mac!r})"
+
     @property
     def type(self) -> str:
         """ The type of the device. Its value can be "ap", "gateway", and "switch". """
@@ -72,10 +86,12 @@ class OmadaDevice:
         """ Uptime of the device, as a display string """
         return self._data["uptimeLong"]
 
-class OmadaLink:
+class OmadaLink(OmadaApiData):
     """ Up/Downlink connection from a switch/ap device. """
-    def __init__(self, data: Dict[str, Any]):
-        self._data = data
+    __slots__ = ()
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(name={self.name!r}, mac={self.mac!r}, port={self.port!r})"
 
     @property
     def mac(self) -> str:
@@ -100,6 +116,8 @@ class OmadaLink:
 
 class OmadaDownlink(OmadaLink):
     """ Downlink connection from a switch/ap port. """
+    __slots__ = ()
+
     @property
     def type(self) -> str:
         """ The type of device downlinked to. """
@@ -113,12 +131,12 @@ class OmadaDownlink(OmadaLink):
 
 class OmadaUplink(OmadaLink):
     """ Uplink connection from a switch/ap device. """
+    __slots__ = ()
 
 
-class OmadaPortStatus:
+class OmadaPortStatus(OmadaApiData):
     """ Status information for a switch port. """
-    def __init__(self, data: Dict[str, Any]):
-        self._data = data
+    __slots__ = ()
 
     @property
     def link_status(self) -> LinkStatus:
@@ -138,9 +156,7 @@ class OmadaPortStatus:
     @property
     def poe_power(self) -> float:
         """ Power (W) supplied over PoE. """
-        if "poePower" in self._data:
-            return self._data["poePower"]
-        return 0.0
+        return self._data.get("poePower", 0.0)
 
     @property
     def bytes_tx(self) -> int:
@@ -157,10 +173,17 @@ class OmadaPortStatus:
         """ Stp blocking status in spanning tree. """
         return self._data["stpDiscarding"]
 
-class OmadaSwitchPort:
+class OmadaSwitchPort(OmadaApiData):
     """ Port on a switch/gateway device. """
+    # There are a lot of ports, so cache port_status in a slot rather than a __dict__
+    __slots__ = ("_port_status",)
+
     def __init__(self, data: Dict[str, Any]):
-        self._data = data
+        super().__init__(data)
+        self._port_status: Optional[OmadaPortStatus] = None
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(port={self.port!r}, name={self.name!r})"
 
     @property
     def port(self) -> int:
@@ -195,13 +218,14 @@ class OmadaSwitchPort:
     @property
     def port_status(self) -> OmadaPortStatus:
         """ Status of the port. """
-        return OmadaPortStatus(self._data["portStatus"])
+        if self._port_status is None:
+            self._port_status = OmadaPortStatus(self._data["portStatus"])
+        return self._port_status
 
 
-class OmadaSwitchDeviceCaps:
+class OmadaSwitchDeviceCaps(OmadaApiData):
     """ Capabilities of a switch. """
-    def __init__(self, data: Dict[str, Any]):
-        self._data = data
+    __slots__ = ()
 
     @property
     def poe_ports(self) -> int:
@@ -221,42 +245,45 @@ class OmadaSwitchDeviceCaps:
 
 class OmadaSwitch(OmadaDevice):
     """ Details of a switch connected to the controller. """
+    # cached_property needs somewhere to store its values
+    __slots__ = ("__dict__",)
 
     @property
     def number_of_ports(self) -> int:
         """ The number of ports on the switch. """
-        if "portNum" in self._data:
-            return self._data["portNum"]
+        port_num = self._data.get("portNum")
+        if port_num is not None:
+            return port_num
         # So much for the docs
         return self._data["deviceMisc"]["portNum"]
 
-    @property
+    @cached_property
     def ports(self) -> List[OmadaSwitchPort]:
         """ List of ports attached to the switch. """
         return [OmadaSwitchPort(p) for p in self._data["ports"]]
 
-    @property
+    @cached_property
     def uplink(self) -> Optional[OmadaUplink]:
         """ Uplink device for this switch. """
-        uplink = self._data["uplink"]
-        if uplink is None:
-            return None
-        return OmadaUplink(uplink)
+        uplink = self._data.get("uplink")
+        return OmadaUplink(uplink) if uplink else None
 
-    @property
+    @cached_property
     def downlink(self) -> List[OmadaDownlink]:
         """ Downlink devices attached to switch. """
-        if "downlinkList" in self._data:
-            return [OmadaDownlink(d) for d in self._data["downlinkList"]]
+        downlink_list = self._data.get("downlinkList")
+        if downlink_list:
+            return [OmadaDownlink(d) for d in downlink_list]
         return []
 
-    @property
+    @cached_property
     def device_capabilities(self) -> OmadaSwitchDeviceCaps:
         """ Capabilities of the switch. """
         return OmadaSwitchDeviceCaps(self._data["devCap"])
 
 class OmadaAccessPoint(OmadaDevice):
     """ Details of an Access Point connected to the controller. """
+    __slots__ = ()
 
     @property
     def wireless_linked(self) -> bool:
@@ -291,6 +318,7 @@ class OmadaAccessPoint(OmadaDevice):
 
 class OmadaSwitchPortDetails(OmadaSwitchPort):
     """ Full details of a port on a switch. """
+    __slots__ = ()
 
     @property
     def port_id(self) -> str:
@@ -372,10 +400,12 @@ class OmadaSwitchPortDetails(OmadaSwitchPort):
         return self._data["portIsolationEnable"]
 
 
-class OmadaPortProfile:
+class OmadaPortProfile(OmadaApiData):
     """ Definition of a switch port configuration profile. """
-    def __init__(self, data: Dict[str, Any]):
-        self._data = data
+    __slots__ = ()
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(name={self.name!r}, profile_id={self.profile_id!r})"
 
     @property
     def profile_id(self) -> str:
@@ -432,10 +462,9 @@ class OmadaPortProfile:
         """ Port isolation (Danger!) """
         return self._data["portIsolationEnable"]
 
-class OmadaInterfaceDetails:
+class OmadaInterfaceDetails(OmadaApiData):
     """ Basic UI Information about controller. """
-    def __init__(self, data: Dict[str, Any]):
-        self._data = data
+    __slots__ = ()
 
     @property
     def controller_name(self) -> str:
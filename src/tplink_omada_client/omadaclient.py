@@ -1,8 +1,16 @@
 """ Simple Http client for Omada controller REST api. """
+import asyncio
 import time
-from typing import (List, Tuple, Optional, Any, Union)
+from typing import (AsyncIterator, List, Tuple, Optional, Any, Union)
 from aiohttp import client_exceptions
 from aiohttp.client import ClientSession
+from aiohttp.connector import TCPConnector
+
+try:
+    # Optional, but much faster at decoding the larger responses
+    from orjson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads
 
 from .definitions import BandwidthControl, Eth802Dot1X, LinkDuplex, LinkSpeed, PoEMode
 
@@ -63,8 +71,9 @@ class OmadaClient:
 
     _own_session: bool
     _controller_id: str
+    _api_url: str
     _controller_version: str
-    _site_id: str
+    _site_id: Optional[str]
     _csrf_token: Optional[str]
     _last_logon: float
 
@@ -76,20 +85,31 @@ class OmadaClient:
             websession: Optional[ClientSession] = None,
             site: str = "Default",
             verify_ssl=True,
+            # Only applies to the session the client creates. Ignored if websession is passed in,
+            # which keeps its own connection limits.
+            pool_size: int = 8,
     ):
 
-        self._url = url
+        self._url = url.rstrip("/")
         self._site = site
         self._username = username
         self._password = password
         self._session = websession
+        self._own_session = False
         self._verify_ssl = verify_ssl
+        self._pool_size = pool_size
         self._csrf_token = None
+        self._site_id = None
+        self._login_lock: Optional[asyncio.Lock] = None
 
     async def _get_session(self) -> ClientSession:
         if self._session is None:
             self._own_session = True
-            self._session = ClientSession()
+            # All requests go to the one controller, so keep a few connections alive for
+            # longer than aiohttp's default 15s, so that polling clients can reuse them.
+            self._session = ClientSession(
+                connector=TCPConnector(limit_per_host=self._pool_size, keepalive_timeout=60)
+            )
         return self._session
 
     async def __aenter__(self):
@@ -123,15 +143,24 @@ class OmadaClient:
             raise UnsupportedControllerVersion(self._controller_version)
 
         self._controller_id = controller_id
+        self._api_url = f"{self._url}/{controller_id}/api/v2"
         self._controller_version = version
 
         auth = {"username": self._username, "password": self._password}
         response = await self._request("post", self._format_url("login"), payload=auth)
 
         self._csrf_token = response["token"]
-        self._last_logon = time.time()
 
-        self._site_id = await self._get_site_id(self._site)
+        # Site ids don't change, so only look it up on the first login, not on every re-login
+        if self._site_id is None:
+            try:
+                self._site_id = await self._get_site_id(self._site)
+            except:
+                # Don't leave a login behind that site requests would treat as usable
+                self._csrf_token = None
+                raise
+
+        self._last_logon = time.monotonic()
 
     async def get_controller_name(self) -> str:
         """ Get the display name of the Omada controller. """
@@ -144,7 +173,7 @@ class OmadaClient:
 
         result = await self._authenticated_request(
             "get",
-            self._format_url("devices", self._site_id)
+            await self._format_site_url("devices")
         )
 
         return [OmadaDevice(d)
@@ -153,7 +182,29 @@ class OmadaClient:
     async def get_switches(self) -> List[OmadaSwitch]:
         """ Get the list of switches on the site. """
 
-        return [await self.get_switch(d) for d in await self.get_devices() if d.type == "switch"]
+        # Fetch the details of each switch concurrently
+        return await asyncio.gather(
+            *(self.get_switch(d) for d in await self.get_devices() if d.type == "switch")
+        )
+
+    async def iter_switches(self) -> AsyncIterator[OmadaSwitch]:
+        """
+        Get the switches on the site, yielding each one as soon as its details arrive.
+
+        Switches are yielded in the order their responses complete, not site order.
+        """
+
+        tasks = [
+            asyncio.ensure_future(self.get_switch(d))
+            for d in await self.get_devices() if d.type == "switch"
+        ]
+        try:
+            for next_switch in asyncio.as_completed(tasks):
+                yield await next_switch
+        finally:
+            # Don't leave requests running if the caller stops iterating early
+            for task in tasks:
+                task.cancel()
 
     async def get_switch(self, mac_or_device: Union[str, OmadaDevice]) -> OmadaSwitch:
         """ Get a switch by Mac address or Omada device. """
@@ -167,7 +218,7 @@ class OmadaClient:
 
         result = await self._authenticated_request(
             "get",
-            self._format_url(f"switches/{mac}", self._site_id)
+            await self._format_site_url(f"switches/{mac}")
         )
 
         return OmadaSwitch(result)
@@ -187,7 +238,7 @@ class OmadaClient:
 
         result = await self._authenticated_request(
             "get",
-            self._format_url(f"switches/{mac}/ports", self._site_id)
+            await self._format_site_url(f"switches/{mac}/ports")
         )
 
         return [OmadaSwitchPortDetails(p) for p in result]
@@ -213,7 +264,7 @@ class OmadaClient:
 
         result = await self._authenticated_request(
             "get",
-            self._format_url(f"switches/{mac}/ports/{port}", self._site_id)
+            await self._format_site_url(f"switches/{mac}/ports/{port}")
         )
 
         return OmadaSwitchPortDetails(result)
@@ -236,13 +287,22 @@ class OmadaClient:
             mac = mac_or_device
 
         if isinstance(index_or_port, OmadaSwitchPort):
-            port = index_or_port
+            port_index = index_or_port.port
+            current_port = index_or_port
         else:
-            port = await self.get_switch_port(mac_or_device, index_or_port)
+            port_index = index_or_port
+            current_port = None
+
+        # We only need the current port settings if some of them are being kept
+        if not new_name or not profile_id:
+            if current_port is None:
+                current_port = await self.get_switch_port(mac, port_index)
+            new_name = new_name or current_port.name
+            profile_id = profile_id or current_port.profile_id
 
         payload = {
-            "name": new_name or port.name,
-            "profileId": profile_id or port.profile_id,
+            "name": new_name,
+            "profileId": profile_id,
             "profileOverrideEnable": not overrides is None
             }
         if overrides:
@@ -260,36 +320,36 @@ class OmadaClient:
 
         await self._authenticated_request(
             "patch",
-            self._format_url(f"switches/{mac}/ports/{port.port}", self._site_id),
+            await self._format_site_url(f"switches/{mac}/ports/{port_index}"),
             payload = payload
         )
 
         # Read back the new port settings
-        return await self.get_switch_port(mac, port)
+        return await self.get_switch_port(mac, port_index)
 
     async def get_port_profiles(self) -> List[OmadaPortProfile]:
         """ Lists the available switch port profiles that can be applied. """
 
         result = await self._authenticated_request(
             "get",
-            self._format_url("setting/lan/profileSummary", self._site_id)
+            await self._format_site_url("setting/lan/profileSummary")
         )
 
         return [OmadaPortProfile(p) for p in result["data"]]
 
+    def _is_login_fresh(self) -> bool:
+        # Assume 1hr is good for a login to remain active, so skip checking it with the controller
+        return bool(self._csrf_token) and time.monotonic() - self._last_logon < 60 * 60
+
     async def _check_login(self) -> bool:
         if not self._csrf_token:
             return False
 
-        if time.time() - self._last_logon < 60 * 60:
-            # Assume 1hr is good for a login to remain active
-            return True
-
         try:
             response = await self._request("get", self._format_url("loginStatus"))
             logged_in = bool(response["login"])
             if logged_in:
-                self._last_logon = time.time()
+                self._last_logon = time.monotonic()
             return logged_in
         except:
             return False
@@ -304,34 +364,49 @@ class OmadaClient:
     async def _get_site_id(self, site_name: str):
         """Get site id by (display) name"""
 
-        # The current user object has a list of allowed sites to administer
-        response = await self._authenticated_request("get", self._format_url("users/current"))
+        # The current user object has a list of allowed sites to administer.
+        # This is called from login(), so the request must not try to log in again.
+        response = await self._request("get", self._format_url("users/current"))
 
-        sites = [
-            s["key"]
-            for s in response["privilege"]["sites"]
-            if s["name"] == site_name
-        ]
+        site_id = next(
+            (s["key"] for s in response["privilege"]["sites"] if s["name"] == site_name),
+            None
+        )
 
-        if len(sites):
-            return sites[0]
+        if site_id is None:
+            raise SiteNotFound(f"Site '{site_name}' not found")
 
-        raise SiteNotFound(f"Site '{site_name}' not found")
+        return site_id
 
     def _format_url(self, end_point:str, site:Optional[str]=None) -> str:
         """Get a REST url for the controller action"""
 
         if site:
-            end_point = f"sites/{site}/{end_point}"
+            return f"{self._api_url}/sites/{site}/{end_point}"
+
+        return f"{self._api_url}/{end_point}"
+
+    async def _format_site_url(self, end_point:str) -> str:
+        """Get a REST url for a site action, logging in first if the site id isn't known yet"""
 
-        return f"{self._url}/{self._controller_id}/api/v2/{end_point}"
+        await self._ensure_login()
+        return self._format_url(end_point, self._site_id)
+
+    async def _ensure_login(self) -> None:
+        if not self._is_login_fresh():
+            # Concurrent requests must not each log in again when the login expires.
+            # The lock is created here, rather than in __init__, so it uses the running loop.
+            if self._login_lock is None:
+                self._login_lock = asyncio.Lock()
+            async with self._login_lock:
+                # Another request may have logged in while we were waiting
+                if not self._is_login_fresh() and not await self._check_login():
+                    await self.login()
 
     async def _authenticated_request(self, method: str, url: str, params=None, payload=None) -> Any:
         """Perform a request specific to the controlller"""
 
-        if not await self._check_login():
-            await self.login()
-
+        await self._ensure_login()
         return await self._request(method, url, params=params, payload=payload)
 
     async def _request(self, method: str, url: str, params=None, payload=None) -> Any:
@@ -357,12 +432,12 @@ class OmadaClient:
 
                 if response.status != 200:
                     if response.content_type == "application/json":
-                        content = await response.json()
+                        content = await response.json(loads=json_loads)
                         self._check_application_errors(content)
 
                     raise RequestFailed(response.status, "HTTP Request Error")
 
-                content = await response.json()
+                content = await response.json(loads=json_loads)
                 self._check_application_errors(content)
 
                 # Unpack response data